@@ -6,18 +6,37 @@ Provides an easy way to start SuperZork adventures
 
 import os
 import sys
-import argparse
 from pathlib import Path
 
 
+# Last directory listing, reused until the stories directory changes
+_STORY_CACHE = {"mtime": None, "list": None}
+
+
 def list_stories():
     """List available story files"""
     stories_dir = Path("stories")
-    if not stories_dir.exists():
+    try:
+        mtime = stories_dir.stat().st_mtime_ns
+    except FileNotFoundError:
         print("No stories directory found!")
         return []
     
-    story_files = list(stories_dir.glob("*.yaml"))
+    # Adding, removing or renaming a story bumps the directory mtime
+    if mtime == _STORY_CACHE["mtime"]:
+        return _STORY_CACHE["list"]
+    
+    # scandir's entries carry the file type from readdir, so filtering
+    # them needs no extra stat() per regular file
+    with os.scandir(stories_dir) as entries:
+        names = sorted(
+            entry.name for entry in entries
+            if entry.name.endswith(".yaml") and entry.is_file()
+        )
+    
+    story_files = [stories_dir / name for name in names]
+    _STORY_CACHE["mtime"] = mtime
+    _STORY_CACHE["list"] = story_files
     return story_files
 
 
@@ -49,13 +68,73 @@ def launch_game(story_file, gui=False):
         print(f"Error: {script} not found!")
         return False
     
-    # Launch the game
-    os.system(f"python {script} -s {story_file}")
+    # Launch the game without an intermediate shell
+    argv = [sys.executable, script, "-s", os.fspath(story_file)]
+    if os.name == "nt":
+        # exec() on Windows spawns a detached child and exits the launcher,
+        # which leaves the console fighting over stdin; wait for it instead
+        # and report the game's real exit status
+        import subprocess
+        
+        return subprocess.run(argv, shell=False, check=False).returncode == 0
+    
+    # Replace the launcher process with the game; exec doesn't flush
+    # Python's buffers, so anything printed so far would be lost when
+    # output is piped
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.execvp(sys.executable, argv)
     return True
 
 
+def interactive_mode():
+    """Let the user pick a story and interface from a menu"""
+    print("SuperZork Adventure Launcher")
+    print("=" * 40)
+    
+    stories = list_stories()
+    if not stories:
+        print("No story files found!")
+        return
+    
+    # Show available stories
+    print("\nSelect an adventure:")
+    for i, story_file in enumerate(stories, 1):
+        name = story_file.stem.replace('_', ' ').title()
+        print(f"{i}. {name}")
+    
+    # Get user choice
+    try:
+        choice = input(f"\nEnter choice (1-{len(stories)}): ").strip()
+        story_index = int(choice) - 1
+        
+        if 0 <= story_index < len(stories):
+            selected_story = stories[story_index]
+            
+            # Ask about interface
+            interface = input("Choose interface (t)erminal or (g)ui [t]: ").strip().lower()
+            use_gui = interface.startswith('g')
+            
+            print(f"\nLaunching {selected_story.name}...")
+            launch_game(selected_story, use_gui)
+        else:
+            print("Invalid choice!")
+    
+    except (ValueError, KeyboardInterrupt):
+        print("\nExiting launcher.")
+
+
 def main():
     """Main launcher function"""
+    # The two most common invocations don't need a parser at all
+    if len(sys.argv) == 1:
+        return interactive_mode()
+    if sys.argv[1:] in (['--list'], ['-l']):
+        print_stories()
+        return
+    
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description="SuperZork Adventure Launcher",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -98,43 +177,12 @@ Examples:
             print(f"Error: Story file '{args.story}' not found!")
             sys.exit(1)
         
-        launch_game(args.story, args.gui)
+        if not launch_game(args.story, args.gui):
+            sys.exit(1)
         return
     
     # Interactive mode
-    print("SuperZork Adventure Launcher")
-    print("=" * 40)
-    
-    stories = list_stories()
-    if not stories:
-        print("No story files found!")
-        return
-    
-    # Show available stories
-    print("\nSelect an adventure:")
-    for i, story_file in enumerate(stories, 1):
-        name = story_file.stem.replace('_', ' ').title()
-        print(f"{i}. {name}")
-    
-    # Get user choice
-    try:
-        choice = input(f"\nEnter choice (1-{len(stories)}): ").strip()
-        story_index = int(choice) - 1
-        
-        if 0 <= story_index < len(stories):
-            selected_story = stories[story_index]
-            
-            # Ask about interface
-            interface = input("Choose interface (t)erminal or (g)ui [t]: ").strip().lower()
-            use_gui = interface.startswith('g')
-            
-            print(f"\nLaunching {selected_story.name}...")
-            launch_game(selected_story, use_gui)
-        else:
-            print("Invalid choice!")
-    
-    except (ValueError, KeyboardInterrupt):
-        print("\nExiting launcher.")
+    interactive_mode()
 
 
 if __name__ == "__main__":
@@ -6,14 +6,21 @@ SuperZork Installation and Setup Script
 import subprocess
 import sys
 import os
+import importlib
+import json
+import shutil
+import urllib.request
 from pathlib import Path
 
 
-def run_command(command, description):
-    """Run a command and report success/failure"""
+OLLAMA_URL = "http://localhost:11434"
+
+
+def run_command(argv, description):
+    """Run a command (an argument list, no shell) and report success/failure"""
     print(f"🔧 {description}...")
     try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
+        result = subprocess.run(argv, check=True, capture_output=True, text=True)
         print(f"✅ {description} completed successfully")
         return True
     except subprocess.CalledProcessError as e:
@@ -23,6 +30,9 @@ def run_command(command, description):
         if e.stderr:
             print(f"stderr: {e.stderr}")
         return False
+    except OSError as e:
+        print(f"❌ {description} failed: {e}")
+        return False
 
 
 def check_python_version():
@@ -36,17 +46,34 @@ def check_python_version():
     return True
 
 
+def fetch_ollama_models():
+    """Return the model names reported by the Ollama server, or None if it is unreachable"""
+    try:
+        with urllib.request.urlopen(f"{OLLAMA_URL}/api/tags", timeout=1) as response:
+            data = json.load(response)
+    except (OSError, ValueError):
+        return None
+    return [model.get("name", "") for model in data.get("models", [])]
+
+
 def check_ollama():
-    """Check if Ollama is available"""
+    """Check if Ollama is installed and its server is running"""
     print("🔍 Checking Ollama availability...")
-    try:
-        result = subprocess.run("ollama --version", shell=True, check=True, capture_output=True, text=True)
-        print(f"✅ Ollama found: {result.stdout.strip()}")
-        return True
-    except subprocess.CalledProcessError:
+    # A PATH lookup answers "is it installed" without starting a process
+    ollama = shutil.which("ollama")
+    if not ollama:
         print("❌ Ollama not found or not accessible")
         print("   Please install Ollama from https://ollama.ai/")
         return False
+    
+    # One HTTP request answers "is it running" without cold-starting the CLI
+    if fetch_ollama_models() is None:
+        print(f"❌ Ollama is installed ({ollama}) but not responding at {OLLAMA_URL}")
+        print("   Please start it with: ollama serve")
+        return False
+    
+    print(f"✅ Ollama found: {ollama}")
+    return True
 
 
 def install_dependencies():
@@ -56,7 +83,7 @@ def install_dependencies():
         return False
     
     return run_command(
-        f"{sys.executable} -m pip install -r requirements.txt",
+        [sys.executable, "-m", "pip", "install", "-r", "requirements.txt"],
         "Installing Python dependencies"
     )
 
@@ -64,28 +91,38 @@ def install_dependencies():
 def check_phi4_mini():
     """Check if phi4-mini model is available in Ollama"""
     print("🔍 Checking for phi4-mini model...")
-    try:
-        result = subprocess.run("ollama list", shell=True, check=True, capture_output=True, text=True)
-        if "phi4-mini" in result.stdout:
-            print("✅ phi4-mini model found")
-            return True
-        else:
-            print("⚠️  phi4-mini model not found")
-            return False
-    except subprocess.CalledProcessError:
+    models = fetch_ollama_models()
+    if models is None:
         print("❌ Could not check Ollama models")
         return False
+    
+    # Names carry a tag, e.g. "phi4-mini:latest"
+    if any(name.split(":")[0] == "phi4-mini" for name in models):
+        print("✅ phi4-mini model found")
+        return True
+    else:
+        print("⚠️  phi4-mini model not found")
+        return False
 
 
 def install_phi4_mini():
     """Install phi4-mini model"""
     print("📥 Installing phi4-mini model (this may take a while)...")
     return run_command(
-        "ollama pull phi4-mini",
+        ["ollama", "pull", "phi4-mini"],
         "Downloading phi4-mini model"
     )
 
 
+def try_import(module_name):
+    """Import a module, returning the ImportError instead of raising it"""
+    try:
+        importlib.import_module(module_name)
+    except ImportError as e:
+        return e
+    return None
+
+
 def test_installation():
     """Test the installation by running a simple query"""
     print("🧪 Testing installation...")
@@ -95,16 +132,15 @@ def test_installation():
         print("❌ Test story file not found")
         return False
     
-    # Try to import required modules
-    try:
-        import yaml
-        import requests
-        import colorama
-        import pygame
-        print("✅ All required modules imported successfully")
-    except ImportError as e:
-        print(f"❌ Import error: {e}")
+    # Try to import required modules, reporting every one that fails
+    modules = ["yaml", "requests", "colorama", "pygame"]
+    errors = [e for e in map(try_import, modules) if e]
+    
+    if errors:
+        for error in errors:
+            print(f"❌ Import error: {error}")
         return False
+    print("✅ All required modules imported successfully")
     
     print("✅ Installation test passed")
     return True
@@ -7,18 +7,34 @@ A classic text adventure game enhanced with AI using Ollama and phi4-mini.
 Inspired by the legendary Zork series.
 """
 
-import requests
-import json
-import yaml
-import argparse
 import sys
 import os
+import time
+import functools
+import threading
 from pathlib import Path
 from typing import Iterator, Any, TypedDict, List
 from colorama import Fore, init, Style
 
-# Initialize colorama for cross-platform colored output
-init(autoreset=True)
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; the stdlib parser reads bytes too
+    from json import loads as json_loads
+
+# Initialize colorama for cross-platform colored output. It is only needed
+# to translate ANSI codes for the Windows console or strip them from piped
+# output; a POSIX terminal understands them natively, so stdout is left
+# unwrapped there. Streaming output sets the color once per response, so
+# writes must not be reset automatically either way.
+if os.name == "nt" or not sys.stdout.isatty():
+    init(autoreset=False)
+
+
+@functools.lru_cache(maxsize=4)
+def _read_prompt(path_str: str, mtime_ns: int) -> str:
+    """Read a prompt file, cached until its modification time changes"""
+    with open(path_str, 'r', encoding='utf-8') as f:
+        return f.read().strip()
 
 
 class Message(TypedDict):
@@ -32,15 +48,74 @@ class SuperZorkGame:
     
     def __init__(self, story_file: str):
         """Initialize the game with a story configuration file"""
+        # Deferred so `--help` and argument errors don't pay for requests
+        import requests
+        
         self.messages: List[Message] = []
+        # Per-message token estimates, kept in step with self.messages
+        self._token_counts: List[int] = []
+        self._total_tokens = 0
+        # tiktoken encoding. get_encoding() may download the vocabulary with
+        # no timeout, so it is loaded on a background thread and token
+        # counts are estimated until it is ready
+        self._tokenizer = None
+        self._loaded_tokenizer = None
         self.load_config(story_file)
+        threading.Thread(target=self._load_tokenizer, daemon=True).start()
+        
+        # One keep-alive connection to Ollama for the whole session
+        self._session = requests.Session()
+        self._session.headers.update({"Content-Type": "application/json"})
+        
+        # Pre-rendered colors and text
+        self._FG = {
+            'user': Fore.GREEN,
+            'assistant': Fore.BLUE,
+            'system': Fore.CYAN
+        }
+        self._RESET = Style.RESET_ALL
+        rule = "=" * 60
+        self._welcome_banner = "\n".join([
+            "",
+            f"{Fore.CYAN}{Style.BRIGHT}{rule}{self._RESET}",
+            f"{Fore.CYAN}{Style.BRIGHT}    SUPERZORK: THE GREAT UNDERGROUND EMPIRE AWAKENS{self._RESET}",
+            f"{Fore.CYAN}{Style.BRIGHT}{rule}{self._RESET}",
+            f"{Fore.YELLOW}Welcome to SuperZork! An AI-powered text adventure.{self._RESET}",
+            f"{Fore.YELLOW}Type your actions naturally. The AI will respond dynamically.{self._RESET}",
+            f"{Fore.MAGENTA}Commands: 'quit' to exit, 'undo' to modify story, 'debug' for history, 'help' for help{self._RESET}",
+            f"{Fore.CYAN}{rule}{self._RESET}",
+            ""
+        ])
+        self._help_text = "\n".join([
+            f"{Fore.CYAN}\n--- SuperZork Help ---{self._RESET}",
+            f"{Fore.YELLOW}Available Commands:{self._RESET}",
+            f"{Fore.WHITE}• quit - Exit the game{self._RESET}",
+            f"{Fore.WHITE}• undo - Modify the last AI response{self._RESET}",
+            f"{Fore.WHITE}• debug - Show conversation history{self._RESET}",
+            f"{Fore.WHITE}• help - Show this help message{self._RESET}",
+            f"{Fore.YELLOW}\nGameplay Tips:{self._RESET}",
+            f"{Fore.WHITE}• Type actions naturally: 'go north', 'examine door', 'take lamp'{self._RESET}",
+            f"{Fore.WHITE}• Be creative! The AI responds to unexpected actions{self._RESET}",
+            f"{Fore.WHITE}• Classic adventure commands work: look, inventory, use, etc.{self._RESET}",
+            f"{Fore.WHITE}• Pay attention to descriptions for clues and hidden details{self._RESET}",
+            f"{Fore.CYAN}--- End Help ---\n{self._RESET}",
+            ""
+        ])
+        
         self.print_welcome()
     
     def load_config(self, story_file: str) -> None:
         """Load game configuration from YAML file"""
+        # Deferred so `--help` and argument errors don't pay for PyYAML
+        import yaml
+        try:
+            from yaml import CSafeLoader as SafeLoader
+        except ImportError:  # PyYAML built without libyaml
+            from yaml import SafeLoader
+        
         try:
-            with open(story_file, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
+            with open(story_file, 'rb') as f:
+                config = yaml.load(f.read(), Loader=SafeLoader)
             
             # Ollama configuration
             self.model = config.get('model', 'phi4-mini')
@@ -68,13 +143,7 @@ class SuperZorkGame:
     
     def print_welcome(self) -> None:
         """Print the game welcome message"""
-        print(f"\n{Fore.CYAN}{Style.BRIGHT}=" * 60)
-        print(f"{Fore.CYAN}{Style.BRIGHT}    SUPERZORK: THE GREAT UNDERGROUND EMPIRE AWAKENS")
-        print(f"{Fore.CYAN}{Style.BRIGHT}=" * 60)
-        print(f"{Fore.YELLOW}Welcome to SuperZork! An AI-powered text adventure.")
-        print(f"{Fore.YELLOW}Type your actions naturally. The AI will respond dynamically.")
-        print(f"{Fore.MAGENTA}Commands: 'quit' to exit, 'undo' to modify story, 'debug' for history, 'help' for help")
-        print(f"{Fore.CYAN}=" * 60 + Style.RESET_ALL)
+        sys.stdout.write(self._welcome_banner)
     
     def color_print(self, message: str, color: str = Fore.WHITE) -> None:
         """Print a colored message"""
@@ -84,14 +153,15 @@ class SuperZorkGame:
         """Load the system prompt from external file"""
         prompt_file = Path("prompts/system_prompt.txt")
         
-        if not prompt_file.exists():
+        try:
+            mtime_ns = prompt_file.stat().st_mtime_ns
+        except FileNotFoundError:
             self.color_print(f"Error: System prompt file not found: {prompt_file}", Fore.RED)
             self.color_print("Please ensure the prompts/system_prompt.txt file exists.", Fore.YELLOW)
             sys.exit(1)
         
         try:
-            with open(prompt_file, 'r', encoding='utf-8') as f:
-                return f.read().strip()
+            return _read_prompt(str(prompt_file), mtime_ns)
         except Exception as e:
             self.color_print(f"Error: Could not load system prompt file: {e}", Fore.RED)
             sys.exit(1)
@@ -122,28 +192,57 @@ Begin the adventure with an atmospheric description of the player's current situ
 
         return story_system_prompt, start_message
     
+    def count_tokens(self, text: str) -> int:
+        """Count the tokens in a text, estimating until tiktoken is loaded"""
+        if self._tokenizer is None:
+            # About 4 characters per token for English text
+            return len(text) // 4
+        return len(self._tokenizer.encode(text, disallowed_special=()))
+    
+    def _load_tokenizer(self) -> None:
+        """Load a tiktoken encoding close to the model's own tokenizer"""
+        # phi4-mini uses an o200k-style vocabulary
+        name = "o200k_base" if self.model.startswith("phi4") else "cl100k_base"
+        try:
+            import tiktoken
+            self._loaded_tokenizer = tiktoken.get_encoding(name)
+        except Exception:  # not installed, or the encoding can't be fetched
+            pass
+    
+    def add_message(self, message: Message) -> None:
+        """Append a message to the conversation and track its token count"""
+        count = self.count_tokens(message['content'])
+        self.messages.append(message)
+        self._token_counts.append(count)
+        self._total_tokens += count
+    
+    def pop_message(self, index: int = -1) -> Message:
+        """Remove a message from the conversation and untrack its token count"""
+        self._total_tokens -= self._token_counts.pop(index)
+        return self.messages.pop(index)
+    
     def truncate_messages(self) -> None:
         """Remove old messages to stay within token limits"""
         if not self.messages or len(self.messages) < 2:
             return
         
-        # Estimate token count (rough approximation)
-        token_counts = [len(message['content'].split()) for message in self.messages]
-        current_total = sum(token_counts)
-          # Remove messages from the middle, keeping system message and recent context
-        index = 1  # Start after system message
-        while current_total > self.num_ctx * 0.8 and len(self.messages) > 3:
-            if index < len(self.messages) - 1:  # Don't remove the last message
-                removed_msg = self.messages.pop(index)
-                current_total -= len(removed_msg['content'].split())
-            else:
-                break
+        if self._tokenizer is None and self._loaded_tokenizer is not None:
+            # The background load has finished; recount what was estimated
+            self._tokenizer = self._loaded_tokenizer
+            self._token_counts = [self.count_tokens(m['content']) for m in self.messages]
+            self._total_tokens = sum(self._token_counts)
+        
+        # Remove messages from the middle, keeping system message and recent context
+        while self._total_tokens > self.num_ctx * 0.8 and len(self.messages) > 3:
+            self.pop_message(1)
     
     def stream_llm_chat(self, message: str) -> Iterator[str]:
         """Stream response from Ollama LLM"""
+        import requests
+        
         # Add user message to conversation
         if message.strip():  # Only add non-empty messages
-            self.messages.append({
+            self.add_message({
                 "role": "user",
                 "content": message
             })
@@ -161,7 +260,7 @@ Begin the adventure with an atmospheric description of the player's current situ
         
         try:
             # Increase timeout and add connection timeout
-            response = requests.post(
+            response = self._session.post(
                 f"{self.ollama_url}/api/chat",
                 json=payload,
                 stream=True,
@@ -169,19 +268,29 @@ Begin the adventure with an atmospheric description of the player's current situ
             )
             response.raise_for_status()
             
-            for line in response.iter_lines():
-                if line:
+            # Ollama sends one JSON record per line. Split the raw bytes
+            # ourselves and hand them straight to the JSON parser, which
+            # returns the content as str; nothing else is ever decoded.
+            # Reading past the final done=true record to the end of the body
+            # lets the keep-alive connection go back to the session's pool.
+            loads = json_loads
+            buf = b""
+            for chunk in response.iter_content(chunk_size=4096):
+                lines = (buf + chunk).split(b"\n")
+                buf = lines.pop()  # incomplete trailing record, if any
+                for line in lines:
+                    if not line:
+                        continue
                     try:
-                        json_data = json.loads(line)
-                        if 'message' in json_data and 'content' in json_data['message']:
-                            content = json_data['message']['content']
-                            if content:
-                                yield content
-                        # Check if we've reached the end of the response
-                        if json_data.get('done', False):
-                            break
-                    except json.JSONDecodeError:
+                        json_data = loads(line)
+                    except ValueError:
                         continue
+                    # Every record but the final summary carries a message
+                    message_data = json_data.get('message')
+                    if message_data is not None:
+                        content = message_data.get('content')
+                        if content:
+                            yield content
                         
         except requests.exceptions.Timeout:
             self.color_print("Request timed out. The AI is taking longer than expected.", Fore.YELLOW)
@@ -194,6 +303,27 @@ Begin the adventure with an atmospheric description of the player's current situ
             self.color_print("Make sure Ollama is running and phi4-mini model is available.", Fore.YELLOW)
             yield "The mystical AI oracle has encountered an error. Please check your connection and try again."
     
+    def stream_response(self, message: str) -> str:
+        """Print the streamed AI response for a message and return its text"""
+        write = sys.stdout.write
+        chunks = []
+        
+        # One color code for the whole response, and flush a few times per
+        # second instead of once per token
+        write(Fore.BLUE)
+        last_flush = time.monotonic()
+        for token in self.stream_llm_chat(message):
+            write(token)
+            chunks.append(token)
+            now = time.monotonic()
+            if now - last_flush >= 0.05:
+                sys.stdout.flush()
+                last_flush = now
+        write(Style.RESET_ALL)
+        sys.stdout.flush()
+        
+        return "".join(chunks)
+    
     def handle_special_commands(self, user_input: str) -> bool:
         """Handle special game commands. Returns True if command was handled."""
         command = user_input.lower().strip()
@@ -207,7 +337,7 @@ Begin the adventure with an atmospheric description of the player's current situ
             
         elif command == "undo":
             if len(self.messages) > 1 and self.messages[-1]["role"] == "assistant":
-                self.messages.pop()
+                self.pop_message()
                 self.color_print("\n--- Story Modification Mode ---", Fore.MAGENTA)
                 self.color_print("How would you like to change what just happened?", Fore.YELLOW)
                 updated_story = input(f"{Fore.MAGENTA}(story update)> {Style.RESET_ALL}")
@@ -217,7 +347,7 @@ Begin the adventure with an atmospheric description of the player's current situ
                         "role": "assistant",
                         "content": updated_story
                     }
-                    self.messages.append(new_message)
+                    self.add_message(new_message)
                     self.color_print(f"\n{Fore.BLUE}Story updated: {updated_story}{Style.RESET_ALL}")
                 else:
                     self.color_print("No changes made.", Fore.YELLOW)
@@ -228,7 +358,7 @@ Begin the adventure with an atmospheric description of the player's current situ
         elif command == "debug":
             self.color_print("\n--- Debug: Conversation History ---", Fore.MAGENTA)
             for i, msg in enumerate(self.messages):
-                role_color = Fore.GREEN if msg['role'] == 'user' else Fore.BLUE if msg['role'] == 'assistant' else Fore.CYAN
+                role_color = self._FG.get(msg['role'], Fore.CYAN)
                 self.color_print(f"{i+1}. [{msg['role'].upper()}]: {msg['content'][:100]}...", role_color)
             self.color_print("--- End Debug ---\n", Fore.MAGENTA)
             return False
@@ -241,25 +371,14 @@ Begin the adventure with an atmospheric description of the player's current situ
     
     def print_help(self) -> None:
         """Print help information"""
-        self.color_print("\n--- SuperZork Help ---", Fore.CYAN)
-        self.color_print("Available Commands:", Fore.YELLOW)
-        self.color_print("• quit - Exit the game", Fore.WHITE)
-        self.color_print("• undo - Modify the last AI response", Fore.WHITE)
-        self.color_print("• debug - Show conversation history", Fore.WHITE)
-        self.color_print("• help - Show this help message", Fore.WHITE)
-        self.color_print("\nGameplay Tips:", Fore.YELLOW)
-        self.color_print("• Type actions naturally: 'go north', 'examine door', 'take lamp'", Fore.WHITE)
-        self.color_print("• Be creative! The AI responds to unexpected actions", Fore.WHITE)
-        self.color_print("• Classic adventure commands work: look, inventory, use, etc.", Fore.WHITE)
-        self.color_print("• Pay attention to descriptions for clues and hidden details", Fore.WHITE)
-        self.color_print("--- End Help ---\n", Fore.CYAN)
+        sys.stdout.write(self._help_text)
     
     def run(self) -> None:
         """Main game loop"""
         try:
             # Initialize the game with system prompt
             system_prompt, first_message = self.build_story_system_prompt()
-            self.messages.append({
+            self.add_message({
                 "role": "system",
                 "content": system_prompt
             })
@@ -267,15 +386,12 @@ Begin the adventure with an atmospheric description of the player's current situ
             # Get initial story description
             self.color_print("\nInitializing the Great Underground Empire...\n", Fore.YELLOW)
             
-            response_text = ""
-            for token in self.stream_llm_chat(first_message):
-                print(f"{Fore.BLUE}{token}{Style.RESET_ALL}", end="", flush=True)
-                response_text += token
+            response_text = self.stream_response(first_message)
             
             # Add AI response to conversation
             if response_text:
-                self.messages.append({
-                    "role": "assistant", 
+                self.add_message({
+                    "role": "assistant",
                     "content": response_text
                 })
             
@@ -297,14 +413,11 @@ Begin the adventure with an atmospheric description of the player's current situ
                     self.truncate_messages()
                     
                     # Get AI response
-                    response_text = ""
-                    for token in self.stream_llm_chat(user_input):
-                        print(f"{Fore.BLUE}{token}{Style.RESET_ALL}", end="", flush=True)
-                        response_text += token
+                    response_text = self.stream_response(user_input)
                     
                     # Add AI response to conversation
                     if response_text:
-                        self.messages.append({
+                        self.add_message({
                             "role": "assistant",
                             "content": response_text
                         })
@@ -321,29 +434,39 @@ Begin the adventure with an atmospheric description of the player's current situ
         except Exception as e:
             self.color_print(f"\nAn unexpected error occurred: {e}", Fore.RED)
             self.color_print("The ancient magic has become unstable. Please restart your adventure.", Fore.YELLOW)
+        finally:
+            self._session.close()
 
 
 def main():
     """Main function"""
-    parser = argparse.ArgumentParser(
-        description="SuperZork: AI-Powered Text Adventure Game",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+    # Plain `-s path` is by far the most common invocation; only build
+    # the full parser for anything else (help, errors, long options)
+    args = sys.argv[1:]
+    if len(args) == 2 and args[0] == "-s" and not args[1].startswith("-"):
+        story = args[1]
+    else:
+        import argparse
+        
+        parser = argparse.ArgumentParser(
+            description="SuperZork: AI-Powered Text Adventure Game",
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+            epilog="""
 Examples:
   python superzork.py -s stories/zork_adventure.yaml
   python superzork.py --story stories/custom_adventure.yaml
-        """
-    )
-    parser.add_argument(
-        "-s", "--story",
-        required=True,
-        help="Path to the YAML story configuration file"
-    )
-    
-    args = parser.parse_args()
+            """
+        )
+        parser.add_argument(
+            "-s", "--story",
+            required=True,
+            help="Path to the YAML story configuration file"
+        )
+        
+        story = parser.parse_args().story
     
     # Create and run the game
-    game = SuperZorkGame(args.story)
+    game = SuperZorkGame(story)
     game.run()
 
 
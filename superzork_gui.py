@@ -10,34 +10,83 @@ Features a retro-styled graphical interface reminiscent of classic computer term
 import pygame
 import sys
 import requests
-import json
 import yaml
 import argparse
-import re
 import os
+import functools
+import itertools
+import queue
+import textwrap
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from pathlib import Path
-from typing import List, Dict, Any, Iterator, Tuple, Optional
+from typing import List, Dict, Any, Tuple, Optional
 from colorama import Fore, init
 
-# Initialize colorama for console output
-init(autoreset=True)
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader
 
-# Initialize pygame
-pygame.init()
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; the stdlib parser reads bytes too
+    from json import loads as json_loads
+
+# Initialize colorama for console output. It is only needed to translate
+# ANSI codes for the Windows console or strip them from piped output; a
+# POSIX terminal understands them natively, so stdout is left unwrapped
+if os.name == "nt" or not sys.stdout.isatty():
+    init(autoreset=True)
+
+# Initialize only the pygame subsystems the game uses (no audio, joystick...)
+pygame.display.init()
+pygame.font.init()
+
+SYSTEM_PROMPT_FILE = Path("prompts/system_prompt.txt")
+
+
+def _read_story(path: str) -> Any:
+    """Read and parse a YAML story file"""
+    with open(path, 'rb') as f:
+        return yaml.load(f.read(), Loader=_SafeLoader)
+
+
+def _read_system_prompt() -> str:
+    """Read the system prompt file"""
+    with open(SYSTEM_PROMPT_FILE, 'r', encoding='utf-8') as f:
+        return f.read().strip()
 
 
 class GameConfig:
     """Configuration class for the GUI game"""
     
-    def __init__(self, story_path: str):
-        """Initialize configuration with default values"""
+    def __init__(self, story_path: str, story: Optional[Future] = None):
+        """Initialize configuration with default values
+
+        story, if given, is a pending _read_story(story_path) result.
+        """
         # Display settings
         self.width, self.height = 1200, 800
         self.font_size = 18
         
         # Try to use a monospace font, fall back to default if not available
-        self.font = self._load_font()
-        self.line_height = self.font.get_height() + 4
+        self.set_font(self._load_font())
+        
+        # One keep-alive connection to Ollama for the whole session;
+        # identity encoding keeps streamed chunks from being buffered
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Connection': 'keep-alive',
+            'Accept-Encoding': 'identity',
+        })
+        # Only one request is ever in flight, and a failed stream is
+        # reported to the player rather than silently re-sent
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         
         # Color scheme - retro terminal colors
         self.colors = {
@@ -54,7 +103,18 @@ class GameConfig:
         }
         
         # Load story configuration
-        self.load_config(story_path)
+        self.load_config(story_path, story)
+    
+    def set_font(self, font: pygame.font.Font) -> None:
+        """Use a font for all text and derive the metrics the layout needs"""
+        self.font = font
+        # size_cached(text) is font.size memoized; a new font starts a new cache
+        self.size_cached = functools.lru_cache(maxsize=8192)(font.size)
+        self.line_height = font.get_height() + 4
+        self.avg_char_width = max(1, self.size_cached('a')[0])
+        # A fixed-width font can be wrapped by character count alone
+        self.char_width = max(1, self.size_cached('M')[0])
+        self.monospace = self.char_width == self.size_cached('i')[0]
     
     def _load_font(self) -> pygame.font.Font:
         """Load the best available monospace font"""
@@ -67,22 +127,23 @@ class GameConfig:
             'monospace'
         ]
         
+        # match_font returns None for a font that isn't installed, where
+        # SysFont would quietly hand back the default font
         for font_name in font_names:
             try:
-                font = pygame.font.SysFont(font_name, self.font_size)
-                if font:
-                    return font
+                font_path = pygame.font.match_font(font_name)
+                if font_path:
+                    return pygame.font.Font(font_path, self.font_size)
             except:
                 continue
         
         # Fall back to default font
         return pygame.font.Font(None, self.font_size)
     
-    def load_config(self, path: str) -> None:
+    def load_config(self, path: str, story: Optional[Future] = None) -> None:
         """Load configuration from YAML file"""
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
+            config = story.result() if story is not None else _read_story(path)
             
             # Ollama settings
             self.model = config.get('model', 'phi4-mini')
@@ -99,29 +160,43 @@ class GameConfig:
                 raise ValueError("Story card is required but not found in configuration")
                 
         except FileNotFoundError:
-            print(f"{Fore.RED}Story file not found: {path}")
+            print(f"{Fore.RED}Story file not found: {path}{Fore.RESET}")
             sys.exit(1)
         except yaml.YAMLError as exc:
-            print(f"{Fore.RED}Error parsing YAML file: {exc}")
+            print(f"{Fore.RED}Error parsing YAML file: {exc}{Fore.RESET}")
             sys.exit(1)
         except Exception as e:
-            print(f"{Fore.RED}Configuration error: {e}")
+            print(f"{Fore.RED}Configuration error: {e}{Fore.RESET}")
             sys.exit(1)
 
 
 class SuperZorkGUI:
     """Main GUI game class"""
     
-    def __init__(self, config: GameConfig):
-        """Initialize the GUI game"""
+    def __init__(self, config: GameConfig, system_prompt: Optional[Future] = None):
+        """Initialize the GUI game
+
+        system_prompt, if given, is a pending _read_system_prompt() result.
+        """
         self.config = config
+        self._system_prompt_future = system_prompt
+        self._system_prompt: Optional[str] = None
+        
+        # Open the connection to Ollama while the window is being set up
+        self._warm_up_thread = threading.Thread(target=self._warm_up_connection, daemon=True)
+        self._warm_up_thread.start()
         
         # Initialize display
-        self.screen = pygame.display.set_mode((self.config.width, self.config.height))
+        self.screen = pygame.display.set_mode(
+            (self.config.width, self.config.height),
+            pygame.DOUBLEBUF | pygame.HWSURFACE
+        )
         pygame.display.set_caption("SuperZork: The Great Underground Empire Awakens")
         
         # Game state
         self.messages = []
+        self._token_counts: List[int] = []
+        self._total_tokens = 0
         self.display_messages = []
         self.is_story_update = False
         self.scroll_offset = 0
@@ -132,15 +207,69 @@ class SuperZorkGUI:
         self.cursor_timer = 0
         
         # AI streaming
-        self.text_generator = None
+        self.stream_thread = None
+        self._chunk_q: "queue.Queue[Optional[str]]" = queue.Queue()
         self.next_word_time = 0
         self.is_ai_typing = False
         
+        # Settled display messages are wrapped once into _frozen_lines as
+        # (line, color); _line_prefix[i] is the frozen line count up to and
+        # including message i. Only the message still streaming is wrapped
+        # per change. Its complete paragraphs keep their lines, cached as
+        # (width, head, head_lines, tail, tail_max_lines, tail_lines)
+        self._frozen_lines: List[Tuple[str, Tuple[int, int, int]]] = []
+        self._line_prefix: List[int] = []
+        self._frozen_width: Optional[int] = None
+        self._live_wrap: Optional[Tuple[int, str, List[str], str, Optional[int], List[str]]] = None
+        # Column wrapper for monospace fonts; breaks only at spaces like the
+        # pixel wrapper does
+        self._text_wrapper = textwrap.TextWrapper(
+            expand_tabs=False,
+            replace_whitespace=False,
+            break_on_hyphens=False,
+            placeholder='',
+        )
+        
+        # Rendered line surfaces by (text, color), least recently used first
+        self._line_surf_cache: OrderedDict = OrderedDict()
+        self._line_surf_cache_size = 512
+        # Set whenever something visible changes; the loop only redraws then.
+        # _text_dirty also redraws the text area, which is otherwise left as
+        # it is while only the status bar and input line change
+        self._dirty = True
+        self._text_dirty = True
+        
         # UI constants
         self.input_height = 40
         self.margin = 20
         self.text_area_height = self.config.height - self.input_height - self.margin * 2
         
+        # Panel backgrounds with their borders, drawn once in display format
+        panel_width = self.config.width - 2 * self.margin
+        self._text_bg = self._make_panel(
+            (panel_width, self.text_area_height),
+            self.config.colors['black'], self.config.colors['dark_green']
+        )
+        self._input_bg = self._make_panel(
+            (panel_width, self.input_height),
+            self.config.colors['dark_gray'], self.config.colors['amber']
+        )
+    
+    def _warm_up_connection(self) -> None:
+        """Connect to Ollama ahead of the first request; failures are left to it"""
+        try:
+            self.config.session.head(f"{self.config.ollama_url}/api/tags", timeout=2)
+        except requests.exceptions.RequestException:
+            pass
+    
+    def _make_panel(self, size: Tuple[int, int], fill: Tuple[int, int, int],
+                    border: Tuple[int, int, int]) -> pygame.Surface:
+        """Create a filled, bordered panel surface converted to the display format"""
+        panel = pygame.Surface(size).convert()
+        panel.fill(fill)
+        pygame.draw.rect(panel, border, panel.get_rect(), 2)
+        return panel
+        
     def build_story_system_prompt(self) -> tuple[str, str]:
         """Build the initial system prompt and first message"""
         story_system_prompt = self.load_system_prompt()
@@ -167,103 +296,250 @@ Begin the adventure with an atmospheric description of the player's current situ
 
         return story_system_prompt, start_message
     
+    def count_tokens(self, text: str) -> int:
+        """Estimate the token count of text from its word count"""
+        return text.count(' ') + 1
+    
+    def add_message(self, message: Dict[str, str]) -> None:
+        """Append a message to the conversation and track its token count"""
+        count = self.count_tokens(message['content'])
+        self.messages.append(message)
+        self._token_counts.append(count)
+        self._total_tokens += count
+    
+    def pop_message(self, index: int = -1) -> Dict[str, str]:
+        """Remove a message from the conversation and untrack its token count"""
+        self._total_tokens -= self._token_counts.pop(index)
+        return self.messages.pop(index)
+    
     def truncate_messages(self) -> None:
         """Remove old messages to stay within token limits"""
         if not self.messages or len(self.messages) < 2:
             return
         
-        # Estimate token count
-        token_counts = [len(message['content'].split()) for message in self.messages]
-        current_total = sum(token_counts)
-          # Remove messages from the middle, keeping system message and recent context
-        index = 1  # Start after system message
-        while current_total > self.config.num_ctx * 0.8 and len(self.messages) > 3:
-            if index < len(self.messages) - 1:
-                removed_msg = self.messages.pop(index)
-                current_total -= len(removed_msg['content'].split())
-            else:
-                break
+        # Remove messages from the middle, keeping system message and recent context
+        while self._total_tokens > self.config.num_ctx * 0.8 and len(self.messages) > 3:
+            self.pop_message(1)
     
-    def wrap_text(self, text: str, max_width: int) -> List[str]:
-        """Wrap text to fit within the specified width"""
-        words = text.split(' ')
+    def wrap_text(self, text: str, max_width: int, max_lines: Optional[int] = None) -> List[str]:
+        """Wrap text to fit within the specified width, stopping after max_lines"""
+        paragraphs = text.split('\n')
+        # A trailing newline doesn't start another (empty) line
+        if paragraphs[-1] == '':
+            paragraphs.pop()
+        
+        if self.config.monospace:
+            wrapper = self._text_wrapper
+            wrapper.width = max(1, max_width // self.config.char_width)
+        
         lines = []
-        current_line = ""
-        
-        for word in words:
-            # Handle newlines in the word
-            if '\n' in word:
-                parts = word.split('\n')
-                for i, part in enumerate(parts):
-                    if i == 0:
-                        test_line = current_line + (' ' if current_line else '') + part
-                    else:
-                        if current_line:
-                            lines.append(current_line)
-                            current_line = ""
-                        test_line = part
-                    
-                    if i < len(parts) - 1:  # Not the last part
-                        # Check if the line fits before adding it
-                        if self.config.font.size(test_line)[0] <= max_width:
-                            lines.append(test_line)
-                        else:
-                            # Break long line into smaller pieces
-                            lines.extend(self._break_long_line(test_line, max_width))
-                        current_line = ""
-                    else:
-                        current_line = test_line
+        for paragraph in paragraphs:
+            if max_lines is not None:
+                remaining = max_lines - len(lines)
+                if remaining <= 0:
+                    break
             else:
-                # Normal word processing
-                test_line = current_line + (' ' if current_line else '') + word
-                text_width = self.config.font.size(test_line)[0]
-                
-                if text_width <= max_width:
-                    current_line = test_line
-                else:
-                    if current_line:
-                        lines.append(current_line)
-                    
-                    # Check if the word itself is too long
-                    word_width = self.config.font.size(word)[0]
-                    if word_width <= max_width:
-                        current_line = word
-                    else:
-                        # Break the long word
-                        lines.extend(self._break_long_line(word, max_width))
-                        current_line = ""
-        
-        if current_line:
-            # Final check for the last line
-            if self.config.font.size(current_line)[0] <= max_width:
-                lines.append(current_line)
+                remaining = None
+            
+            if not paragraph:
+                lines.append('')
+            elif self.config.monospace and paragraph.isascii() and paragraph.isprintable():
+                # Printable ASCII is exactly char_width wide per character;
+                # tabs, control characters and glyphs the font lacks are
+                # not, so those paragraphs are measured in pixels below.
+                # An empty placeholder keeps the last line's words unchanged
+                wrapper.max_lines = remaining
+                lines.extend(wrapper.wrap(paragraph))
             else:
-                lines.extend(self._break_long_line(current_line, max_width))
+                lines.extend(self._wrap_paragraph(paragraph, max_width, remaining))
+        return lines
+    
+    def _wrap_paragraph(self, text: str, max_width: int,
+                        max_lines: Optional[int] = None) -> List[str]:
+        """Wrap a single line of text at spaces"""
+        size = self.config.size_cached
+        estimate = max(1, max_width // self.config.avg_char_width)
+        lines = []
+        start = 0
+        length = len(text)
+        
+        while start < length:
+            if max_lines is not None and len(lines) >= max_lines:
+                break
+            
+            # Lines never start with a space
+            if text[start] == ' ':
+                start += 1
+                continue
+            
+            # Guess where the line ends: measure an optimistic slice based on
+            # the average character width once, then grow or shrink it a
+            # character width at a time
+            end = min(length, start + estimate)
+            width = size(text[start:end])[0]
+            while end < length and width + size(text[end])[0] <= max_width:
+                width += size(text[end])[0]
+                end += 1
+            while end > start and width > max_width:
+                end -= 1
+                width -= size(text[end])[0]
+            
+            # Summed character widths ignore kerning, so settle the break
+            # with real measurements of the whole line: drop trailing words
+            # until it fits, then take following words while they still fit
+            while True:
+                line_end = length if end >= length else text.rfind(' ', start, end + 1)
+                if line_end <= start or size(text[start:line_end])[0] <= max_width:
+                    break
+                end = line_end - 1
+            
+            if line_end <= start:
+                word_end = text.find(' ', start)
+                if word_end == -1:
+                    word_end = length
+                if size(text[start:word_end])[0] > max_width:
+                    # The word alone is wider than a line
+                    lines.extend(self._break_long_line(
+                        text[start:word_end], max_width,
+                        None if max_lines is None else max_lines - len(lines)
+                    ))
+                    start = word_end + 1
+                    continue
+                line_end = word_end
+            
+            while line_end < length:
+                next_end = text.find(' ', line_end + 1)
+                if next_end == -1:
+                    next_end = length
+                if size(text[start:next_end])[0] > max_width:
+                    break
+                line_end = next_end
+            
+            lines.append(text[start:line_end])
+            start = line_end + 1
         
         return lines
     
-    def _break_long_line(self, text: str, max_width: int) -> List[str]:
+    def _break_long_line(self, text: str, max_width: int,
+                         max_lines: Optional[int] = None) -> List[str]:
         """Break a long line that doesn't fit into smaller pieces"""
         if not text:
             return []
         
-        lines = []
-        current_line = ""
-        
-        for char in text:
-            test_line = current_line + char
-            if self.config.font.size(test_line)[0] <= max_width:
-                current_line = test_line
-            else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = char
+        # Keep a running width from cached per-character widths instead of
+        # re-measuring the growing piece. Separately measured characters
+        # don't add up exactly to the rendered text (kerning, rounding), so
+        # scale them by one measurement of the whole text, and confirm each
+        # piece with a real measurement before emitting it.
+        size = self.config.size_cached
+        char_widths = [size(char)[0] for char in text]
+        total = sum(char_widths)
+        scale = size(text)[0] / total if total else 1.0
         
-        if current_line:
-            lines.append(current_line)
+        lines = []
+        start = 0
+        length = len(text)
+        while start < length:
+            if max_lines is not None and len(lines) >= max_lines:
+                break
+            end = start + 1
+            cur_w = char_widths[start] * scale
+            while end < length and cur_w + char_widths[end] * scale <= max_width:
+                cur_w += char_widths[end] * scale
+                end += 1
+            
+            while end - start > 1 and size(text[start:end])[0] > max_width:
+                end -= 1
+            while end < length and size(text[start:end + 1])[0] <= max_width:
+                end += 1
+            
+            lines.append(text[start:end])
+            start = end
         
         return lines
     
+    def _message_content(self, message: Dict[str, Any]) -> str:
+        """Return a display message's content, joining any buffered stream chunks"""
+        chunks = message.get('_chunks')
+        if chunks:
+            message['content'] += ''.join(chunks)
+            chunks.clear()
+        return message['content']
+    
+    def _message_style(self, message: Dict[str, Any]) -> Tuple[str, Tuple[int, int, int]]:
+        """Return the displayed text and color of a display message"""
+        if message['role'] == 'user':
+            return f"> {message['content']}", self.config.colors['amber']
+        return self._message_content(message), self.config.colors['green']
+    
+    def _unfreeze_from(self, index: int) -> None:
+        """Drop the frozen lines of display messages from index on"""
+        if index < len(self._line_prefix):
+            del self._frozen_lines[self._line_prefix[index - 1] if index else 0:]
+            del self._line_prefix[index:]
+    
+    def _sync_frozen_lines(self, max_width: int) -> int:
+        """Wrap newly settled display messages; returns how many are settled"""
+        settled = len(self.display_messages) - (1 if self.is_ai_typing else 0)
+        if max_width != self._frozen_width:
+            self._unfreeze_from(0)
+            self._frozen_width = max_width
+        else:
+            self._unfreeze_from(settled)
+        
+        for message in self.display_messages[len(self._line_prefix):settled]:
+            content, color = self._message_style(message)
+            self._frozen_lines.extend((line, color) for line in self.wrap_text(content, max_width))
+            self._line_prefix.append(len(self._frozen_lines))
+        return settled
+    
+    def _wrapped_lines(self, content: str, max_width: int, max_lines: Optional[int] = None) -> List[str]:
+        """Wrap the streaming message, re-wrapping only text that may have changed"""
+        # The stream only ever appends, so paragraphs that already ended with
+        # a newline keep their lines; only the text after the last newline
+        # is wrapped again
+        cached = self._live_wrap
+        if cached is None or cached[0] != max_width or not content.startswith(cached[1]):
+            cached = (max_width, '', [], None, None, [])
+        _, head, head_lines, tail, tail_max, tail_lines = cached
+        
+        split = content.rfind('\n') + 1
+        if split > len(head):
+            head_lines = head_lines + self.wrap_text(content[len(head):split], max_width)
+            head = content[:split]
+            tail = None
+        
+        if max_lines is not None:
+            max_lines -= len(head_lines)
+            if max_lines <= 0:
+                self._live_wrap = (max_width, head, head_lines, tail, tail_max, tail_lines)
+                return head_lines
+        
+        if (tail != content[split:]
+                or not (tail_max is None or (max_lines is not None and max_lines <= tail_max))):
+            tail = content[split:]
+            tail_max = max_lines
+            tail_lines = self.wrap_text(tail, max_width, max_lines)
+        
+        self._live_wrap = (max_width, head, head_lines, tail, tail_max, tail_lines)
+        return head_lines + tail_lines
+    
+    def _get_line_surface(self, line: str, color: Tuple[int, int, int]) -> pygame.Surface:
+        """Render a line of text, reusing the surface from earlier frames"""
+        key = (line, color)
+        surface = self._line_surf_cache.get(key)
+        if surface is not None:
+            self._line_surf_cache.move_to_end(key)
+            return surface
+        
+        # Convert once to the display's pixel format so every later blit
+        # is a plain copy
+        surface = self.config.font.render(line, True, color).convert_alpha()
+        self._line_surf_cache[key] = surface
+        if len(self._line_surf_cache) > self._line_surf_cache_size:
+            self._line_surf_cache.popitem(last=False)
+        return surface
+    
     def draw_text_area(self) -> None:
         """Draw the main text area"""
         text_rect = pygame.Rect(
@@ -274,35 +550,54 @@ Begin the adventure with an atmospheric description of the player's current situ
         )
         
         # Draw background
-        pygame.draw.rect(self.screen, self.config.colors['black'], text_rect)
-        pygame.draw.rect(self.screen, self.config.colors['dark_green'], text_rect, 2)
+        self.screen.blit(self._text_bg, text_rect)
           # Calculate text rendering area with more precise margins
         text_margin = 15  # Internal margin for text
         text_width = text_rect.width - (text_margin * 2)  # Account for both sides
         y_pos = text_rect.y + text_margin - self.scroll_offset
         
-        # Render messages
-        for message in self.display_messages:
-            if message['role'] == 'user':
-                color = self.config.colors['amber']
-                content = f"> {message['content']}"
-            else:
-                color = self.config.colors['green']
-                content = message['content']
-              # Wrap and render text
-            lines = self.wrap_text(content, text_width)
-            for line in lines:
-                if y_pos > text_rect.bottom:
-                    break
-                if y_pos + self.config.line_height > text_rect.y:
-                    text_surface = self.config.font.render(line, True, color)
-                    self.screen.blit(text_surface, (text_rect.x + text_margin, y_pos))
-                y_pos += self.config.line_height
+        # Render messages: settled ones from the frozen lines, then the one
+        # still streaming, which is the only message wrapped again
+        settled = self._sync_frozen_lines(text_width)
+        live_lines = []
+        live_y = y_pos + len(self._frozen_lines) * self.config.line_height
+        if settled < len(self.display_messages) and live_y <= text_rect.bottom:
+            # Lines past the bottom of the text area are never drawn, so
+            # stop wrapping the streaming message there
+            remaining = max(0, (text_rect.bottom - live_y) // self.config.line_height) + 1
+            content, color = self._message_style(self.display_messages[settled])
+            live_lines = [(line, color) for line in self._wrapped_lines(content, text_width, remaining)]
+        
+        # Every line is line_height tall, so jump straight to the first one
+        # that reaches into the text area instead of walking past the
+        # scrolled-out history
+        first = max(0, (text_rect.y - y_pos) // self.config.line_height)
+        y_pos += first * self.config.line_height
+        frozen_count = len(self._frozen_lines)
+        if first < frozen_count:
+            lines = itertools.chain(self._frozen_lines[first:], live_lines)
+        else:
+            lines = live_lines[first - frozen_count:]
+        
+        # Keep partly scrolled-out lines inside the text area, so they don't
+        # spill into the status bar, which is redrawn on its own
+        self.screen.set_clip(text_rect)
+        for line, color in lines:
+            if y_pos > text_rect.bottom:
+                break
+            if y_pos + self.config.line_height > text_rect.y:
+                text_surface = self._get_line_surface(line, color)
+                self.screen.blit(text_surface, (text_rect.x + text_margin, y_pos))
+            y_pos += self.config.line_height
+        self.screen.set_clip(None)
         
         # Auto-scroll if text goes beyond visible area
         max_y = y_pos + self.scroll_offset
         if max_y > text_rect.bottom - self.config.line_height:
-            self.scroll_offset = max_y - text_rect.bottom + self.config.line_height * 2
+            new_offset = max_y - text_rect.bottom + self.config.line_height * 2
+            if new_offset != self.scroll_offset:
+                self.scroll_offset = new_offset
+                self._text_dirty = True
     
     def draw_input_area(self) -> None:
         """Draw the input area"""
@@ -314,8 +609,7 @@ Begin the adventure with an atmospheric description of the player's current situ
         )
         
         # Draw background
-        pygame.draw.rect(self.screen, self.config.colors['dark_gray'], input_rect)
-        pygame.draw.rect(self.screen, self.config.colors['amber'], input_rect, 2)
+        self.screen.blit(self._input_bg, input_rect)
         
         # Prepare input text with prompt
         prompt = "(update story)> " if self.is_story_update else "> "
@@ -337,14 +631,21 @@ Begin the adventure with an atmospheric description of the player's current situ
         else:
             status_text += "Ready"
         
+        # Clear the strip above the text area; it is redrawn without the
+        # rest of the screen, so the text is clipped to it as well rather
+        # than spilling onto the text panel below
+        strip = (0, 0, self.config.width, self.margin)
+        self.screen.fill(self.config.colors['black'], strip)
         text_surface = self.config.font.render(status_text, True, self.config.colors['cyan'])
+        self.screen.set_clip(strip)
         self.screen.blit(text_surface, (self.margin, 5))
+        self.screen.set_clip(None)
     
-    def stream_llm_chat(self, message: str) -> Iterator[str]:
-        """Stream response from Ollama LLM"""
+    def stream_llm_chat(self, message: str) -> threading.Thread:
+        """Start streaming a response from Ollama LLM on a background thread"""
         # Add user message to conversation
         if message.strip():
-            self.messages.append({
+            self.add_message({
                 "role": "user",
                 "content": message
             })
@@ -352,16 +653,27 @@ Begin the adventure with an atmospheric description of the player's current situ
         # Prepare request payload
         payload = {
             "model": self.config.model,
-            "messages": self.messages,
+            "messages": list(self.messages),
             "stream": True,
             "options": {
                 "num_ctx": self.config.num_ctx,
                 "temperature": self.config.temperature,
             }        }
         
+        # The network reads happen off the render loop; chunks are handed
+        # over through the queue and drained by update_ai_response
+        thread = threading.Thread(target=self._stream_producer, args=(payload,), daemon=True)
+        thread.start()
+        return thread
+    
+    def _stream_producer(self, payload: Dict[str, Any]) -> None:
+        """Read the Ollama stream and queue content chunks, then a None sentinel"""
+        put = self._chunk_q.put
+        # Let the warm-up finish so its connection is the one reused
+        self._warm_up_thread.join()
         try:
             # Increase timeout and add connection timeout
-            response = requests.post(
+            response = self.config.session.post(
                 f"{self.config.ollama_url}/api/chat",
                 json=payload,
                 stream=True,
@@ -369,33 +681,47 @@ Begin the adventure with an atmospheric description of the player's current situ
             )
             response.raise_for_status()
             
-            for line in response.iter_lines():
-                if line:
+            # Ollama sends one JSON record per line. Split the raw bytes
+            # ourselves and hand them straight to the JSON parser. Reading
+            # past the final done=true record to the end of the body lets
+            # the keep-alive connection go back to the session's pool.
+            loads = json_loads
+            buf = b""
+            for chunk in response.iter_content(chunk_size=8192):
+                lines = (buf + chunk).split(b"\n")
+                buf = lines.pop()  # incomplete trailing record, if any
+                for line in lines:
+                    if not line:
+                        continue
                     try:
-                        json_data = json.loads(line)
-                        if 'message' in json_data and 'content' in json_data['message']:
-                            content = json_data['message']['content']
-                            if content:
-                                yield content
-                        # Check if we've reached the end of the response
-                        if json_data.get('done', False):
-                            break
-                    except json.JSONDecodeError:
+                        json_data = loads(line)
+                    except ValueError:
                         continue
+                    # Every record but the final summary carries a message
+                    message_data = json_data.get('message')
+                    if message_data is not None:
+                        content = message_data.get('content')
+                        if content:
+                            put(content)
                         
         except requests.exceptions.Timeout:
             print("Request timed out. The AI is taking longer than expected.")
-            yield "The ancient spirits are taking their time to respond... Perhaps try a simpler command or restart the game if this persists."
+            put("The ancient spirits are taking their time to respond... Perhaps try a simpler command or restart the game if this persists.")
         except requests.exceptions.ConnectionError:
             print("Could not connect to Ollama. Make sure it's running.")
-            yield "The magical connection to the underground realm has been severed. Please ensure Ollama is running and try again."
+            put("The magical connection to the underground realm has been severed. Please ensure Ollama is running and try again.")
         except requests.exceptions.RequestException as e:
             print(f"Error connecting to Ollama: {e}")
-            yield "The mystical AI oracle has encountered an error. Please check your connection and try again."
+            put("The mystical AI oracle has encountered an error. Please check your connection and try again.")
+        finally:
+            put(None)
     
     def process_input(self, user_input: str) -> bool:
         """Process user input. Returns True if game should continue."""
-        command = user_input.lower().strip()
+        # Only short input can be one of the commands below, so longer
+        # input is never lowercased
+        stripped = user_input.strip()
+        command = stripped.lower() if len(stripped) <= 5 else ""
         
         if command == "quit":
             return False
@@ -405,9 +731,10 @@ Begin the adventure with an atmospheric description of the player's current situ
                 return True
             
             if len(self.messages) > 1 and self.messages[-1]["role"] == "assistant":
-                self.messages.pop()
+                self.pop_message()
                 if self.display_messages and self.display_messages[-1]["role"] == "assistant":
                     self.display_messages.pop()
+                    self._unfreeze_from(len(self.display_messages))
                 self.is_story_update = True
                 return True
             else:
@@ -423,7 +750,7 @@ Begin the adventure with an atmospheric description of the player's current situ
         # Handle story update mode
         if self.is_story_update:
             if user_input.strip():
-                self.messages.append({
+                self.add_message({
                     "role": "assistant",
                     "content": user_input
                 })
@@ -446,10 +773,11 @@ Begin the adventure with an atmospheric description of the player's current situ
             self.truncate_messages()
             
             # Start AI response
-            self.text_generator = self.stream_llm_chat(user_input)
+            self.stream_thread = self.stream_llm_chat(user_input)
             self.display_messages.append({
                 "role": "assistant",
-                "content": ""
+                "content": "",
+                "_chunks": []  # streamed text not yet joined into content
             })
             self.is_ai_typing = True
             self.next_word_time = pygame.time.get_ticks() + 100
@@ -457,65 +785,104 @@ Begin the adventure with an atmospheric description of the player's current situ
         return True
     
     def update_ai_response(self) -> None:
-        """Update AI response streaming"""
-        if self.text_generator and pygame.time.get_ticks() > self.next_word_time:
-            try:
-                next_chunk = next(self.text_generator)
+        """Append any chunks the stream thread has queued, without blocking"""
+        if self.stream_thread and pygame.time.get_ticks() > self.next_word_time:
+            finished = False
+            received = []
+            # Take everything that has arrived, but give the frame back after
+            # a few milliseconds if the stream is far ahead of the display
+            deadline = pygame.time.get_ticks() + 4
+            while pygame.time.get_ticks() < deadline:
+                try:
+                    chunk = self._chunk_q.get_nowait()
+                except queue.Empty:
+                    break
+                if chunk is None:
+                    finished = True
+                    break
+                received.append(chunk)
+            
+            if received:
                 if self.display_messages:
-                    self.display_messages[-1]['content'] += next_chunk
-                self.next_word_time = pygame.time.get_ticks() + 50  # Faster typing
-            except StopIteration:
+                    self.display_messages[-1]['_chunks'].extend(received)
+                self._text_dirty = True
+            
+            if finished:
                 # AI finished responding
-                self.text_generator = None
+                self.stream_thread = None
                 self.is_ai_typing = False
+                self._text_dirty = True
                 
                 # Add final response to conversation
                 if self.display_messages:
-                    self.messages.append({
+                    last = self.display_messages[-1]
+                    content = self._message_content(last)
+                    last.pop('_chunks', None)
+                    self.add_message({
                         "role": "assistant",
-                        "content": self.display_messages[-1]['content']
+                        "content": content
                     })
     
     def load_system_prompt(self) -> str:
         """Load the system prompt from external file"""
-        prompt_file = Path("prompts/system_prompt.txt")
+        if self._system_prompt is not None:
+            return self._system_prompt
         
-        if not prompt_file.exists():
-            print(f"Error: System prompt file not found: {prompt_file}")
+        try:
+            if self._system_prompt_future is not None:
+                self._system_prompt = self._system_prompt_future.result()
+            else:
+                self._system_prompt = _read_system_prompt()
+        except FileNotFoundError:
+            print(f"Error: System prompt file not found: {SYSTEM_PROMPT_FILE}")
             print("Please ensure the prompts/system_prompt.txt file exists.")
             sys.exit(1)
-        
-        try:
-            with open(prompt_file, 'r', encoding='utf-8') as f:
-                return f.read().strip()
         except Exception as e:
             print(f"Error: Could not load system prompt file: {e}")
             sys.exit(1)
+        return self._system_prompt
 
     def run(self) -> None:
         """Main game loop"""
         clock = pygame.time.Clock()
+        # Starts SDL's timer, which pygame.init() used to; get_ticks() reads 0 until then
+        clock.tick()
         
         try:
             # Initialize the game
             system_prompt, first_message = self.build_story_system_prompt()
-            self.messages.append({"role": "system", "content": system_prompt})
+            self.add_message({"role": "system", "content": system_prompt})
             
             # Start with the initial story
-            self.text_generator = self.stream_llm_chat(first_message)
-            self.display_messages = [{"role": "assistant", "content": ""}]
+            self.stream_thread = self.stream_llm_chat(first_message)
+            self.display_messages = [{"role": "assistant", "content": "", "_chunks": []}]
             self.is_ai_typing = True
             self.next_word_time = pygame.time.get_ticks() + 500
             
             running = True
+            last_ticks = pygame.time.get_ticks()
             while running:
-                # Handle events
-                for event in pygame.event.get():
+                # Handle events; while idle with nothing left to draw, sleep
+                # until input arrives or the cursor is due to blink instead of
+                # polling every frame
+                if self.is_ai_typing or self._text_dirty or self._dirty:
+                    events = pygame.event.get()
+                else:
+                    event = pygame.event.wait(max(1, 500 - self.cursor_timer))
+                    events = pygame.event.get()
+                    if event.type != pygame.NOEVENT:
+                        events.insert(0, event)
+                for event in events:
                     if event.type == pygame.QUIT:
                         running = False
                         
+                    elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                        self._text_dirty = True
+                        
                     elif event.type == pygame.KEYDOWN and not self.is_ai_typing:
+                        self._dirty = True
                         if event.key == pygame.K_RETURN:
+                            self._text_dirty = True
                             if self.input_text.strip():
                                 if not self.process_input(self.input_text):
                                     running = False
@@ -534,24 +901,40 @@ Begin the adventure with an atmospheric description of the player's current situ
                 # Update AI response
                 self.update_ai_response()
                 
-                # Update cursor blinking
-                self.cursor_timer += clock.get_time()
+                # Update cursor blinking; the elapsed time includes any wait
+                # for events above
+                now = pygame.time.get_ticks()
+                self.cursor_timer += now - last_ticks
+                last_ticks = now
                 if self.cursor_timer > 500:  # Blink every 500ms
                     self.cursor_visible = not self.cursor_visible
                     self.cursor_timer = 0
+                    self._dirty = True
                 
-                # Render everything
-                self.screen.fill(self.config.colors['black'])
-                self.draw_status_bar()
-                self.draw_text_area()
-                self.draw_input_area()
-                
-                pygame.display.flip()
+                # Render only when something changed; drawing the text area
+                # may set its flag again if it had to scroll
+                if self._text_dirty:
+                    self._text_dirty = False
+                    self._dirty = False
+                    self.screen.fill(self.config.colors['black'])
+                    self.draw_status_bar()
+                    self.draw_text_area()
+                    self.draw_input_area()
+                    
+                    pygame.display.flip()
+                elif self._dirty:
+                    self._dirty = False
+                    self.draw_status_bar()
+                    self.draw_input_area()
+                    
+                    pygame.display.flip()
+                # Caps redraws (and polling while streaming) at 60 FPS
                 clock.tick(60)
                 
         except Exception as e:
             print(f"Game error: {e}")
         finally:
+            self.config.session.close()
             pygame.quit()
 
 
@@ -575,9 +958,16 @@ Examples:
     args = parser.parse_args()
     
     try:
+        # Read the story and system prompt from disk while pygame looks up
+        # fonts and opens the window; errors surface where they are used
+        loader = ThreadPoolExecutor(max_workers=2)
+        story = loader.submit(_read_story, args.story)
+        system_prompt = loader.submit(_read_system_prompt)
+        loader.shutdown(wait=False)
+        
         # Create and run the game
-        config = GameConfig(args.story)
-        game = SuperZorkGUI(config)
+        config = GameConfig(args.story, story)
+        game = SuperZorkGUI(config, system_prompt)
         game.run()
     except Exception as e:
         print(f"Failed to start game: {e}")
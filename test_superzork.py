@@ -8,6 +8,11 @@ import sys
 import yaml
 from pathlib import Path
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader
+
 def test_imports():
     """Test that all modules import correctly."""
     print("🧪 Testing imports...")
@@ -47,6 +52,34 @@ def test_system_prompt():
         print(f"❌ System prompt loading failed: {e}")
         return False
 
+def test_token_tracking():
+    """Test that the running token estimate follows message changes."""
+    print("\n🧪 Testing conversation token tracking...")
+    
+    try:
+        from superzork import SuperZorkGame
+        game = SuperZorkGame('stories/zork_adventure.yaml')
+        game.num_ctx = 100
+        game.add_message({"role": "system", "content": "s" * 40})
+        for i in range(10):
+            game.add_message({"role": "user", "content": "u" * 20})
+            game.add_message({"role": "assistant", "content": "a" * 20})
+        game.pop_message()
+        game.truncate_messages()
+        
+        expected = sum(game.count_tokens(m['content']) for m in game.messages)
+        if game._total_tokens != expected:
+            print(f"❌ Running total {game._total_tokens} != recomputed {expected}")
+            return False
+        if game._total_tokens > game.num_ctx * 0.8 or game.messages[0]['role'] != 'system':
+            print("❌ Conversation was not truncated correctly")
+            return False
+        print(f"✅ Token tracking works ({len(game.messages)} messages kept)")
+        return True
+    except Exception as e:
+        print(f"❌ Token tracking failed: {e}")
+        return False
+
 def test_story_files():
     """Test that story files are valid YAML."""
     print("\n🧪 Testing story files...")
@@ -64,8 +97,8 @@ def test_story_files():
     all_valid = True
     for story_file in story_files:
         try:
-            with open(story_file, 'r', encoding='utf-8') as f:
-                yaml.safe_load(f)
+            with open(story_file, 'rb') as f:
+                yaml.load(f.read(), Loader=_SafeLoader)
             print(f"✅ {story_file.name} is valid YAML")
         except Exception as e:
             print(f"❌ {story_file.name} is invalid: {e}")
@@ -98,6 +131,58 @@ def test_config_validation():
         print(f"❌ Configuration validation failed: {e}")
         return False
 
+def test_config_key_scan():
+    """Test the top-level key scan that short-circuits missing fields."""
+    print("\n🧪 Testing configuration key scan...")
+    
+    try:
+        import tempfile
+        from validate_config import ConfigValidator, _scan_top_level_keys
+        
+        # The shipped stories quote their model, and must still be scanned
+        for story_file in Path('stories').glob('*.yaml'):
+            keys = _scan_top_level_keys(story_file.read_bytes())
+            if keys is None or not ConfigValidator.REQUIRED_FIELDS <= keys:
+                print(f"❌ Key scan missed fields in {story_file.name}: {keys}")
+                return False
+        
+        expected = {
+            b'model: "a \\" b" # comment\nstory_card: |\n  text\n': {'model', 'story_card'},
+            b"'model': 'it''s'\nnum_tokens: 4096\n": {'model', 'num_tokens'},
+            b'{"model": "x", "story_card": "y"}': None,        # flow style
+            b'model: &m x\nplayer_card: *m\n': None,            # anchors
+            b'base: x\n<<: {model: y}\n': None,                 # merge key
+            b'model: "unclosed\n  quote"\n': None,              # multi-line quote
+            b'# only a comment\n': None,
+            b'companion_cards:\n  - |\n    text\n  - "q"\nmodel: x\n': {'companion_cards', 'model'},
+            # Documents the parser rejects must not be scanned
+            b'model: "phi4-mini"\n---\nstory_card: |\n  text\n': None,   # second document
+            b'model: x\n\tplayer_card: oops\n': None,                     # tab indentation
+            b'model: - phi4\nstory_card: x\n': None,                       # indicator
+            b'model: a: b\n': None,                                         # nested mapping value
+            b'story_card: x\n  bad: : :\nplayer_card: y\n': None,          # stray indented line
+        }
+        for data, keys in expected.items():
+            if _scan_top_level_keys(data) != keys:
+                print(f"❌ Key scan of {data!r} gave {_scan_top_level_keys(data)}, expected {keys}")
+                return False
+        
+        # Missing fields are reported without a full parse
+        with tempfile.TemporaryDirectory() as tmp:
+            story_file = Path(tmp) / 'missing.yaml'
+            story_file.write_text('model: "phi4-mini"\nstory_card: |\n  text\n')
+            validator = ConfigValidator()
+            if validator.validate_file(story_file) or validator.errors != [
+                    "Missing required field: player_card"]:
+                print(f"❌ Missing field not reported: {validator.errors}")
+                return False
+        
+        print("✅ Configuration key scan works")
+        return True
+    except Exception as e:
+        print(f"❌ Configuration key scan failed: {e}")
+        return False
+
 def main():
     """Run all tests."""
     print("🚀 SuperZork System Test")
@@ -106,8 +191,10 @@ def main():
     tests = [
         test_imports,
         test_system_prompt,
+        test_token_tracking,
         test_story_files,
-        test_config_validation
+        test_config_validation,
+        test_config_key_scan
     ]
     
     passed = 0
@@ -2,30 +2,313 @@
 """
 SuperZork Configuration Validator
 Validates YAML story configuration files
+
+Results are cached in a .validate_cache directory under the current working
+directory, holding at most one entry per story file.
 """
 
-import yaml
+import functools
+import hashlib
+import json
+import os
+import re
 import sys
-import argparse
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Iterator, List, Optional, Set, Tuple
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; the stdlib parser reads bytes too
+    from json import loads as json_loads
+
+# A story file validates in well under a millisecond, so below this many
+# files starting worker processes costs more than it saves
+PARALLEL_MIN_FILES = 64
+
+# Results are cached per (path, mtime, size) of the story file, in memory
+# and on disk so repeated runs skip unchanged files. The validator's own
+# mtime is part of the key, so editing the rules invalidates old entries.
+# Each file's entry replaces its previous one on disk, and the directory is
+# trimmed to the newest entries past _DISK_CACHE_SIZE.
+CACHE_DIR = Path(".validate_cache")
+_DISK_CACHE_SIZE = 512
+_VALIDATOR_MTIME_NS = os.stat(__file__).st_mtime_ns
+# The in-memory layer keeps the most recently used results, least recently
+# used first, so a long-running caller revalidating edited files stays bounded
+_result_cache: 'OrderedDict[str, Tuple[List[str], List[str]]]' = OrderedDict()
+_RESULT_CACHE_SIZE = 256
+
+# A finding from the checks: ("error" | "warning", message)
+Diagnostic = Tuple[str, str]
+
+
+# The form a top-level "key:" line takes in a block mapping when the key is
+# plain or quoted, and the form of a "- " item line of a block sequence
+_TOP_LEVEL_KEY = re.compile(
+    rb'(?:([A-Za-z_][\w-]*)|"([^"\\\n]*)"|\'([^\'\n]*)\')[ \t]*:(?: +|\r?$)'
+)
+_SEQUENCE_ITEM = re.compile(rb'( +)-(?: +|\r?$)')
+# Values the scan can vouch for: a block scalar header without an explicit
+# indentation, or a quoted string closed on the same line; either may be
+# followed by a comment
+_BLOCK_SCALAR_HEADER = re.compile(rb'[|>][+-]?[ \t]*(?: #.*)?\r?$')
+_QUOTED_VALUE = re.compile(
+    rb'(?:"(?:[^"\\\n]|\\[^\n])*"|\'(?:[^\'\n]|\'\')*\')[ \t]*(?: #.*)?\r?$'
+)
+# Characters that can't start a plain value, or make it mean something else
+_INDICATORS = b'-?:,[]{}#&*!|>\'"%@`'
+_MAPPING_VALUE = re.compile(rb':(?:[ \t]|\r?$)')
+
+# Story files written as a JSON object are also valid YAML and parse far
+# faster with a JSON parser. Exponent floats are left to YAML, which reads
+# a number like 1e3 as a string.
+_JSON_OBJECT_START = re.compile(rb'\s*\{')
+_EXPONENT = re.compile(rb'[0-9][eE][-+]?[0-9]')
+
+
+def _value_kind(value: bytes) -> Optional[str]:
+    """Classify the value on a key or item line for the key scan.
+
+    Returns 'empty', 'block' (a block scalar header), 'scalar', or None if
+    the scan can't tell whether the parser would accept it.
+    """
+    if not value.strip() or value.lstrip().startswith(b'#'):
+        return 'empty'
+    first = value[:1]
+    if first in b'|>':
+        return 'block' if _BLOCK_SCALAR_HEADER.match(value) else None
+    if first in b'"\'':
+        return 'scalar' if _QUOTED_VALUE.match(value) else None
+    if first in _INDICATORS or _MAPPING_VALUE.search(value):
+        return None
+    return 'scalar'
+
+
+def _scan_top_level_keys(data: bytes) -> Optional[Set[str]]:
+    """Find the top-level keys of a YAML block mapping without parsing it.
+
+    Only the layout the story files use is recognised: top-level keys with a
+    plain, quoted or block scalar value, or a sequence of such items.
+    Anything else - flow style, anchors, tags, merge keys, tabs, extra
+    documents, or lines the parser might reject - returns None and is left
+    to the real parser, so the scan never hides a syntax error.
+    """
+    if data.startswith(b'\xef\xbb\xbf'):
+        data = data[3:]
+    keys = set()
+    in_sequence = False    # the current key holds a block sequence
+    item_indent = None
+    block_parent = None    # indentation of the line that opened a block scalar
+    block_indent = None    # indentation of that block scalar's content
+    leading_blank = 0      # widest blank line before the block's content
+    for number, line in enumerate(data.split(b'\n')):
+        content = line.lstrip(b' ')
+        if content.startswith(b'\t'):
+            return None
+        indent = len(line) - len(content)
+        if not content.strip():
+            leading_blank = max(leading_blank, indent)
+            continue
+        
+        if block_parent is not None:
+            if indent > block_parent:
+                if block_indent is None:
+                    if indent < leading_blank:
+                        return None
+                    block_indent = indent
+                elif indent < block_indent:
+                    return None
+                continue
+            block_parent = None
+        if content.startswith(b'#'):
+            continue
+        
+        if indent:
+            # Only the items of a sequence may be indented here
+            match = _SEQUENCE_ITEM.match(line) if in_sequence else None
+            if match is None or indent != (item_indent or indent):
+                return None
+            item_indent = indent
+            kind = _value_kind(line[match.end():])
+            if kind == 'block':
+                block_parent, block_indent, leading_blank = indent, None, 0
+            elif kind != 'scalar':
+                return None
+            continue
+        
+        if number == 0 and line.rstrip() == b'---':
+            continue
+        match = _TOP_LEVEL_KEY.match(line)
+        if match is None:
+            return None
+        kind = _value_kind(line[match.end():])
+        if kind is None:
+            return None
+        in_sequence, item_indent = kind == 'empty', None
+        if kind == 'block':
+            block_parent, block_indent, leading_blank = 0, None, 0
+        key = match.group(1) or match.group(2) or match.group(3) or b''
+        keys.add(key.decode('utf-8', 'replace'))
+    return keys or None
+
+
+# Characters looked at on each end of a text when deciding, without
+# stripping it, that it is long enough
+_EDGE_CHECK = 8
+
+
+def _shorter_than(text: str, minimum: int) -> bool:
+    """Return whether text.strip() is shorter than minimum.
+
+    Only texts close to the limit or padded with whitespace are stripped;
+    for the rest a non-space character near each end settles it.
+    """
+    length = len(text)
+    if length < minimum:
+        return True
+    if (length >= minimum + 2 * _EDGE_CHECK
+            and not text[:_EDGE_CHECK].isspace()
+            and not text[-_EDGE_CHECK:].isspace()):
+        return False
+    return len(text.strip()) < minimum
+
+
+@functools.lru_cache(maxsize=None)
+def _yaml_safe_loader():
+    """Return PyYAML's safe loader class, imported on first use.
+
+    libyaml's C parser ships with the PyYAML wheels; a PyYAML built from
+    source without libyaml falls back to the pure-Python loader.
+    """
+    try:
+        from yaml import CSafeLoader as loader
+    except ImportError:
+        from yaml import SafeLoader as loader
+    return loader
+
+
+def _cache_key(file_path: Path, stat: os.stat_result) -> str:
+    """Build the cache key for a story file's current contents.
+
+    The key starts with a hash of the path alone, so entries for earlier
+    revisions of the same file can be found and removed.
+    """
+    path = os.path.abspath(file_path)
+    revision = f"{path}|{stat.st_mtime_ns}|{stat.st_size}|{_VALIDATOR_MTIME_NS}"
+    return (hashlib.sha1(path.encode('utf-8')).hexdigest()[:16] + '-'
+            + hashlib.sha1(revision.encode('utf-8')).hexdigest())
+
+
+def _load_cached_result(key: str) -> Optional[Tuple[List[str], List[str]]]:
+    """Return cached (errors, warnings) for a key, or None"""
+    result = _result_cache.get(key)
+    if result is not None:
+        _result_cache.move_to_end(key)
+        return result
+    try:
+        with open(CACHE_DIR / f"{key}.json", 'rb') as f:
+            data = json.load(f)
+        result = (data['errors'], data['warnings'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    _remember_result(key, result)
+    return result
+
+
+def _remember_result(key: str, result: Tuple[List[str], List[str]]) -> None:
+    """Add a result to the in-memory cache, dropping the oldest if it is full"""
+    _result_cache[key] = result
+    if len(_result_cache) > _RESULT_CACHE_SIZE:
+        _result_cache.popitem(last=False)
+
+
+def _store_cached_result(key: str, errors: List[str], warnings: List[str]) -> None:
+    """Remember (errors, warnings) for a key; the disk cache is best effort"""
+    _remember_result(key, (list(errors), list(warnings)))
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        with open(CACHE_DIR / f"{key}.json", 'w', encoding='utf-8') as f:
+            json.dump({'errors': errors, 'warnings': warnings}, f)
+        _prune_disk_cache(key)
+    except OSError:
+        pass
+
+
+def _prune_disk_cache(key: str) -> None:
+    """Drop older entries for the key's file, then the oldest past the size cap"""
+    path_prefix = key.split('-', 1)[0] + '-'
+    current = f"{key}.json"
+    kept = []
+    with os.scandir(CACHE_DIR) as entries:
+        for entry in entries:
+            if entry.name == current or not entry.name.endswith('.json'):
+                continue
+            if entry.name.startswith(path_prefix):
+                os.unlink(entry.path)
+            else:
+                kept.append(entry)
+    # Leave room for the entry just written
+    excess = len(kept) + 1 - _DISK_CACHE_SIZE
+    if excess > 0:
+        kept.sort(key=lambda entry: entry.stat().st_mtime_ns)
+        for entry in kept[:excess]:
+            os.unlink(entry.path)
 
 
 class ConfigValidator:
     """Validates SuperZork story configuration files"""
     
-    REQUIRED_FIELDS = [
+    # Required fields, in the order their problems are reported
+    REQUIRED_ORDER = (
         'model',
         'story_card',
         'player_card'
-    ]
+    )
+    REQUIRED_FIELDS = frozenset(REQUIRED_ORDER)
     
-    OPTIONAL_FIELDS = [
+    OPTIONAL_FIELDS = frozenset({
         'ollama_url',
         'num_tokens', 
         'temperature',
         'companion_cards'
-    ]
+    })
+    
+    # Field rules, built once when the class is defined rather than on
+    # every validation
+    NUMERIC_FIELDS = {
+        'num_tokens': (512, 32768, "Context length"),
+        'temperature': (0.0, 2.0, "Temperature")
+    }
+    NUMBER_TYPES = (int, float)
+    # Expected type of each known field, the error reported otherwise, and
+    # whether an empty value is left alone; listed in report order
+    FIELD_TYPES = {
+        'model': (str, "Model must be a string", True),
+        'ollama_url': (str, "ollama_url must be a string", True),
+        'num_tokens': (NUMBER_TYPES, "num_tokens must be a number", False),
+        'temperature': (NUMBER_TYPES, "temperature must be a number", False),
+        'story_card': (str, "story_card must be a string", True),
+        'player_card': (str, "player_card must be a string", True),
+        'companion_cards': (list, "companion_cards must be a list", False),
+    }
+    TEXT_FIELDS = ('story_card', 'player_card')
+    TEXT_MIN_LENGTH = 50
+    TEXT_MAX_LENGTH = 2000
+    COMPANION_MIN_LENGTH = 30
+    # Messages that depend only on the field, formatted once
+    _MISSING_MESSAGES = {field: f"Missing required field: {field}" for field in REQUIRED_ORDER}
+    _EMPTY_MESSAGES = {field: f"Required field is empty: {field}" for field in REQUIRED_ORDER}
+    # (comprehensions in a class body can't see the length limits, hence
+    # the templates)
+    _SHORT_MESSAGES = dict(zip(TEXT_FIELDS, map(
+        f"{{}} is quite short (< {TEXT_MIN_LENGTH} characters)".format, TEXT_FIELDS)))
+    _LONG_MESSAGES = dict(zip(TEXT_FIELDS, map(
+        f"{{}} is very long (> {TEXT_MAX_LENGTH} characters)".format, TEXT_FIELDS)))
+    _COMMON_MODELS = frozenset({
+        'phi4-mini', 'llama2', 'llama3', 'mistral', 'gemma',
+        'codellama', 'vicuna', 'orca-mini'
+    })
     
     def __init__(self):
         self.errors = []
@@ -36,136 +319,165 @@ class ConfigValidator:
         self.errors = []
         self.warnings = []
         
-        if not file_path.exists():
+        try:
+            stat = file_path.stat()
+        except OSError:
             self.errors.append(f"File not found: {file_path}")
             return False
         
+        key = _cache_key(file_path, stat)
+        cached = _load_cached_result(key)
+        if cached is not None:
+            self.errors, self.warnings = list(cached[0]), list(cached[1])
+            return len(self.errors) == 0
+        
+        # yaml is imported here rather than at module level, so importers
+        # and cache hits don't pay for it
+        import yaml
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
+            diagnostics = list(self._check_file(file_path))
         except yaml.YAMLError as e:
-            self.errors.append(f"YAML parsing error: {e}")
-            return False
+            diagnostics = [('error', f"YAML parsing error: {e}")]
         except Exception as e:
+            # Unreadable files say nothing about their contents, so the
+            # result is not cached
             self.errors.append(f"File reading error: {e}")
             return False
         
-        if not isinstance(config, dict):
-            self.errors.append("Configuration must be a YAML dictionary")
-            return False
-        
-        # Check required fields
-        for field in self.REQUIRED_FIELDS:
-            if field not in config:
-                self.errors.append(f"Missing required field: {field}")
-            elif not config[field] or not config[field].strip():
-                self.errors.append(f"Required field is empty: {field}")
-        
-        # Validate specific fields
-        self._validate_model(config.get('model'))
-        self._validate_numeric_fields(config)
-        self._validate_text_fields(config)
-        self._validate_companion_cards(config.get('companion_cards'))
-        
+        self.errors = [message for kind, message in diagnostics if kind == 'error']
+        self.warnings = [message for kind, message in diagnostics if kind == 'warning']
+        _store_cached_result(key, self.errors, self.warnings)
         return len(self.errors) == 0
     
-    def _validate_model(self, model: Any) -> None:
-        """Validate model field"""
-        if not model:
-            return
+    @classmethod
+    def _check_file(cls, file_path: Path) -> Iterator[Diagnostic]:
+        """Parse a configuration file and yield the problems found in it"""
+        with open(file_path, 'rb') as f:
+            # A line scan can tell that required fields are missing
+            # without parsing the large story texts
+            data = f.read()
+            top_level_keys = _scan_top_level_keys(data)
+            if top_level_keys is not None:
+                missing = cls.REQUIRED_FIELDS - top_level_keys
+                if missing:
+                    yield from cls._missing_fields(missing)
+                    return
+            config = None
+            if _JSON_OBJECT_START.match(data) and not _EXPONENT.search(data):
+                try:
+                    config = json_loads(data)
+                except ValueError:
+                    pass
+            if config is None:
+                import yaml
+                f.seek(0)
+                config = yaml.load(f, Loader=_yaml_safe_loader())
         
-        if not isinstance(model, str):
-            self.errors.append("Model must be a string")
+        if not isinstance(config, dict):
+            yield ('error', "Configuration must be a YAML dictionary")
             return
         
-        common_models = [
-            'phi4-mini', 'llama2', 'llama3', 'mistral', 'gemma',
-            'codellama', 'vicuna', 'orca-mini'
-        ]
-        
-        if model not in common_models:
-            self.warnings.append(f"Uncommon model '{model}' - ensure it's available in Ollama")
-    
-    def _validate_numeric_fields(self, config: Dict[str, Any]) -> None:
-        """Validate numeric configuration fields"""
-        numeric_fields = {
-            'num_tokens': (512, 32768, "Context length"),
-            'temperature': (0.0, 2.0, "Temperature")
-        }
-        
-        for field, (min_val, max_val, description) in numeric_fields.items():
-            value = config.get(field)
-            if value is None:
-                continue
-            
-            if not isinstance(value, (int, float)):
-                self.errors.append(f"{field} must be a number")
+        # Check required fields in report order, each either missing or
+        # empty; a set difference against the key view tells in one step
+        # whether any are missing at all
+        get = config.get
+        missing = cls.REQUIRED_FIELDS - config.keys()
+        for field in cls.REQUIRED_ORDER:
+            if missing and field in missing:
+                yield ('error', cls._MISSING_MESSAGES[field])
                 continue
-            
-            if not (min_val <= value <= max_val):
-                self.warnings.append(
-                    f"{field} ({value}) outside recommended range {min_val}-{max_val}"
-                )
-    
-    def _validate_text_fields(self, config: Dict[str, Any]) -> None:
-        """Validate text content fields"""
-        text_fields = ['story_card', 'player_card']
-        
-        for field in text_fields:
-            value = config.get(field)
-            if not value:
-                continue
-            
-            if not isinstance(value, str):
-                self.errors.append(f"{field} must be a string")
+            value = get(field)
+            # isspace() answers the same question as strip() without
+            # copying the text
+            if not value or (isinstance(value, str) and value.isspace()):
+                yield ('error', cls._EMPTY_MESSAGES[field])
+        
+        # Check every field's type in one pass, keeping the values that
+        # have the right type for the range and length checks below
+        typed = {}
+        for field, (types, message, skip_empty) in cls.FIELD_TYPES.items():
+            value = get(field)
+            if value is None or (skip_empty and not value):
                 continue
-            
-            # Check length
-            if len(value.strip()) < 50:
-                self.warnings.append(f"{field} is quite short (< 50 characters)")
-            elif len(value) > 2000:
-                self.warnings.append(f"{field} is very long (> 2000 characters)")
-    
-    def _validate_companion_cards(self, companions: Any) -> None:
-        """Validate companion cards field"""
-        if companions is None:
-            return
+            if isinstance(value, types):
+                typed[field] = value
+            else:
+                yield ('error', message)
+        typed_get = typed.get
         
-        if not isinstance(companions, list):
-            self.errors.append("companion_cards must be a list")
-            return
+        # Model
+        model = typed_get('model')
+        if model is not None and model not in cls._COMMON_MODELS:
+            yield ('warning', f"Uncommon model '{model}' - ensure it's available in Ollama")
         
-        for i, companion in enumerate(companions):
-            if not isinstance(companion, str):
-                self.errors.append(f"Companion card {i+1} must be a string")
+        # Numeric ranges
+        for field, (min_val, max_val, description) in cls.NUMERIC_FIELDS.items():
+            value = typed_get(field)
+            if value is not None and not (min_val <= value <= max_val):
+                yield ('warning', f"{field} ({value}) outside recommended range {min_val}-{max_val}")
+        
+        # Text lengths
+        for field in cls.TEXT_FIELDS:
+            value = typed_get(field)
+            if value is None:
                 continue
-            
-            if len(companion.strip()) < 30:
-                self.warnings.append(f"Companion card {i+1} is quite short")
+            if _shorter_than(value, cls.TEXT_MIN_LENGTH):
+                yield ('warning', cls._SHORT_MESSAGES[field])
+            elif len(value) > cls.TEXT_MAX_LENGTH:
+                yield ('warning', cls._LONG_MESSAGES[field])
+        
+        # Companion cards
+        companions = typed_get('companion_cards')
+        if companions is not None:
+            min_length = cls.COMPANION_MIN_LENGTH
+            for i, companion in enumerate(companions):
+                # Parsed YAML never holds str subclasses, so an exact type
+                # check will do
+                if type(companion) is not str:
+                    yield ('error', f"Companion card {i+1} must be a string")
+                    continue
+                
+                if _shorter_than(companion, min_length):
+                    yield ('warning', f"Companion card {i+1} is quite short")
+    
+    @classmethod
+    def _missing_fields(cls, missing: Set[str]) -> Iterator[Diagnostic]:
+        """Yield an error for each missing required field, in report order"""
+        for field in cls.REQUIRED_ORDER:
+            if field in missing:
+                yield ('error', cls._MISSING_MESSAGES[field])
     
     def print_results(self, file_path: Path) -> None:
         """Print validation results"""
-        print(f"\nValidation Results for: {file_path}")
-        print("=" * 50)
+        # Build the whole report and write it once instead of print()ing
+        # each line
+        out = [f"\nValidation Results for: {file_path}\n", "=" * 50, "\n"]
         
         if not self.errors and not self.warnings:
-            print("✅ Configuration is valid!")
+            out.append("✅ Configuration is valid!\n")
+            sys.stdout.write("".join(out))
             return
         
         if self.errors:
-            print(f"❌ Errors ({len(self.errors)}):")
-            for i, error in enumerate(self.errors, 1):
-                print(f"  {i}. {error}")
+            out.append(f"❌ Errors ({len(self.errors)}):\n")
+            out.append("".join(f"  {i}. {error}\n" for i, error in enumerate(self.errors, 1)))
         
         if self.warnings:
-            print(f"⚠️  Warnings ({len(self.warnings)}):")
-            for i, warning in enumerate(self.warnings, 1):
-                print(f"  {i}. {warning}")
+            out.append(f"⚠️  Warnings ({len(self.warnings)}):\n")
+            out.append("".join(f"  {i}. {warning}\n" for i, warning in enumerate(self.warnings, 1)))
         
         if not self.errors:
-            print("\n✅ Configuration is valid (with warnings)")
+            out.append("\n✅ Configuration is valid (with warnings)\n")
         else:
-            print(f"\n❌ Configuration has {len(self.errors)} error(s)")
+            out.append(f"\n❌ Configuration has {len(self.errors)} error(s)\n")
+        sys.stdout.write("".join(out))
+
+
+def _validate_one(file_path: Path) -> Tuple[bool, List[str], List[str]]:
+    """Validate one file in a worker process; returns (is_valid, errors, warnings)"""
+    validator = ConfigValidator()
+    is_valid = validator.validate_file(file_path)
+    return is_valid, validator.errors, validator.warnings
 
 
 def validate_all_stories():
@@ -175,7 +487,12 @@ def validate_all_stories():
         print("Stories directory not found!")
         return False
     
-    story_files = list(stories_dir.glob("*.yaml"))
+    # One scandir pass; its entries already know whether they are files
+    with os.scandir(stories_dir) as entries:
+        story_files = [
+            Path(entry.path) for entry in entries
+            if entry.name.endswith(".yaml") and entry.is_file()
+        ]
     if not story_files:
         print("No YAML files found in stories directory!")
         return False
@@ -185,8 +502,17 @@ def validate_all_stories():
     
     print(f"Found {len(story_files)} story files to validate:")
     
-    for story_file in story_files:
-        is_valid = validator.validate_file(story_file)
+    # Files are independent, so larger sets are validated across processes;
+    # results come back in file order and are printed from here
+    if len(story_files) >= PARALLEL_MIN_FILES and (os.cpu_count() or 1) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor() as executor:
+            results = list(executor.map(_validate_one, story_files, chunksize=4))
+    else:
+        results = map(_validate_one, story_files)
+    
+    for story_file, (is_valid, errors, warnings) in zip(story_files, results):
+        validator.errors, validator.warnings = errors, warnings
         validator.print_results(story_file)
         
         if not is_valid:
@@ -199,6 +525,8 @@ def validate_all_stories():
 
 def main():
     """Main function"""
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description="SuperZork Configuration Validator",
         formatter_class=argparse.RawDescriptionHelpFormatter,